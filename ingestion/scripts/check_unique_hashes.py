@@ -3,7 +3,9 @@
 
 import sys
 from pathlib import Path
-import pandas as pd
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 
 
 def check_unique_hashes(parquet_dir: Path) -> tuple[bool, dict]:
@@ -27,25 +29,24 @@ def check_unique_hashes(parquet_dir: Path) -> tuple[bool, dict]:
         print(f"  - {f.name}")
     print()
 
-    # Collect all hashes
-    all_hashes = []
+    # Per-file counts and schema checks come from the footer metadata alone
     file_hash_counts = {}
 
     for parquet_file in parquet_files:
-        df = pd.read_parquet(parquet_file)
-
-        if 'sha256' not in df.columns:
+        metadata = pq.read_metadata(parquet_file)
+        if 'sha256' not in metadata.schema.names:
             print(f"❌ File {parquet_file.name} does not have a 'sha256' column")
             return False, {}
 
-        hashes = df['sha256'].tolist()
-        all_hashes.extend(hashes)
-        file_hash_counts[parquet_file.name] = len(hashes)
-        print(f"  {parquet_file.name}: {len(hashes)} hashes")
+        file_hash_counts[parquet_file.name] = metadata.num_rows
+        print(f"  {parquet_file.name}: {metadata.num_rows} hashes")
 
     print()
+    # Scan only the sha256 column of every file as one Arrow array; the
+    # dataset scanner reads files in parallel and never builds a DataFrame
+    all_hashes = ds.dataset(parquet_files, format='parquet').to_table(columns=['sha256']).column('sha256')
     total_hashes = len(all_hashes)
-    unique_hashes = len(set(all_hashes))
+    unique_hashes = len(pc.unique(all_hashes))
 
     stats = {
         'total_files': len(parquet_files),
@@ -65,11 +66,9 @@ def check_unique_hashes(parquet_dir: Path) -> tuple[bool, dict]:
         print(f"❌ Found {duplicates} duplicate hash(es)!")
 
         # Find and report duplicates
-        hash_counts = {}
-        for h in all_hashes:
-            hash_counts[h] = hash_counts.get(h, 0) + 1
-
-        duplicate_hashes = {h: count for h, count in hash_counts.items() if count > 1}
+        hash_counts = pc.value_counts(all_hashes)
+        repeated = pc.filter(hash_counts, pc.greater(hash_counts.field('counts'), 1))
+        duplicate_hashes = dict(zip(repeated.field('values').to_pylist(), repeated.field('counts').to_pylist()))
         print(f"\nDuplicate hashes:")
         for hash_val, count in sorted(duplicate_hashes.items()):
             print(f"  {hash_val}: appears {count} times")
@@ -1,18 +1,49 @@
 import argparse
 import base64
+import binascii
+import functools
 import os
 import re
 
-import requests
-import urllib3
+from pipeline_utils import get_session
 
+DOWNLOAD_URL = "https://michildwelfarepubliclicensingsearch.michigan.gov/licagencysrch/webruntime/api/apex/execute?language=en-US&asGuest=true&htmlEncode=false"
 
-def fetch_pdf_bytes(document_id: str) -> bytes | None:
-    """Fetch a PDF from the Michigan API and return raw bytes, or None on failure."""
-    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+DOWNLOAD_HEADERS = {
+    'Accept': 'application/json, text/plain, */*',
+    'Content-Type': 'application/json',
+    'X-Requested-With': 'XMLHttpRequest',
+    'Origin': 'https://michildwelfarepubliclicensingsearch.michigan.gov',
+    'Referer': 'https://michildwelfarepubliclicensingsearch.michigan.gov/licagencysrch/'
+}
 
-    base_url = "https://michildwelfarepubliclicensingsearch.michigan.gov/licagencysrch/webruntime/api/apex/execute?language=en-US&asGuest=true&htmlEncode=false"
+# The API wraps the PDF as {"returnValue": "<base64>"}.  Pulling the payload
+# out of the raw body with a regex avoids decoding the whole JSON document
+# into a multi-megabyte str just to re-encode it for base64.
+_RETURN_VALUE_RE = re.compile(rb'"returnValue"\s*:\s*"([A-Za-z0-9+/=]*)"')
 
+# Filename helpers, compiled once since generate_filename runs per document
+# Each problematic character, or each whitespace run, becomes one underscore
+_UNSAFE_RE = re.compile(r'[<>:"/\\|?*]|\s+')
+_DATE_RE = re.compile(r'(\d{4})[-/](\d{2})[-/](\d{2})')
+
+
+def _looks_like_pdf(pdf_bytes: bytes) -> bool:
+    """Cheap sanity check that the bytes are a whole PDF, not an error page or a truncated body.
+
+    Readers accept the header anywhere in the first 1024 bytes and tolerate
+    trailing junk after ``%%EOF``, so both markers are searched for loosely.
+    """
+    return b'%PDF-' in pdf_bytes[:1024] and b'%%EOF' in pdf_bytes[-1024:]
+
+
+def fetch_pdf_bytes(document_id: str) -> bytes:
+    """Fetch a PDF from the Michigan API and return raw bytes.
+
+    Raises:
+        Exception: On any HTTP, decoding, or validation failure, so callers
+            can record the actual reason
+    """
     payload = {
         "namespace": "",
         "classname": "@udd/01p8z0000009E4V",
@@ -25,50 +56,77 @@ def fetch_pdf_bytes(document_id: str) -> bytes | None:
         "cacheable": False
     }
 
-    headers = {
-        'Accept': 'application/json, text/plain, */*',
-        'Content-Type': 'application/json',
-        'X-Requested-With': 'XMLHttpRequest',
-        'Origin': 'https://michildwelfarepubliclicensingsearch.michigan.gov',
-        'Referer': 'https://michildwelfarepubliclicensingsearch.michigan.gov/licagencysrch/'
-    }
-
-    try:
-        response = requests.post(
-            base_url,
-            json=payload,
-            headers=headers,
-            verify=False,
-            timeout=60
-        )
-        response.raise_for_status()
+    response = get_session().post(
+        DOWNLOAD_URL,
+        json=payload,
+        headers=DOWNLOAD_HEADERS,
+        verify=False,
+        timeout=60
+    )
+    response.raise_for_status()
+    content = response.content
+    match = _RETURN_VALUE_RE.search(content)
+    if match:
+        # Decode from a zero-copy view of the body rather than copying
+        # the base64 span out first (b64decode would copy it again)
+        pdf_bytes = binascii.a2b_base64(memoryview(content)[match.start(1):match.end(1)])
+    else:
+        # Unexpected envelope (e.g. escaped characters); fall back to JSON
         data = response.json()
-        return base64.b64decode(data['returnValue'])
-    except Exception as e:
-        print(f"Failed to fetch PDF for {document_id}: {e}")
-        return None
+        pdf_bytes = base64.b64decode(data['returnValue'])
+    if not _looks_like_pdf(pdf_bytes):
+        raise ValueError(f"response is not a complete PDF ({len(pdf_bytes)} bytes)")
+    return pdf_bytes
 
 
 def save_pdf(pdf_bytes: bytes, document_id: str, document_agency=None,
              document_name=None, document_date=None, output_dir="./") -> str:
-    """Save PDF bytes to disk. Returns the file path."""
+    """Save PDF bytes to disk. Returns the file path.
+
+    The bytes are written to a temporary ``.part`` file and renamed into
+    place, so an interrupted write never leaves a truncated PDF behind.
+    """
     filename = generate_filename(document_id, document_agency, document_name, document_date)
     os.makedirs(output_dir, exist_ok=True)
     file_path = os.path.join(output_dir, filename)
-    with open(file_path, 'wb') as f:
-        f.write(pdf_bytes)
+    tmp_path = file_path + '.part'
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(pdf_bytes)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        # Don't leave a partial .part file behind on a failed or interrupted write
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
     return file_path
 
 
 def download_michigan_pdf(document_id, document_agency=None, document_name=None,
-                          document_date=None, output_dir="./"):
+                          document_date=None, output_dir="./", skip_existing=True):
     """Fetch a PDF and save it to disk (convenience wrapper).
 
+    If ``skip_existing`` is set and the target file is already present, the
+    API call is skipped entirely and the existing path is returned.
+
     Returns:
         str: Path to the downloaded file if successful, None if failed
     """
-    pdf_bytes = fetch_pdf_bytes(document_id)
-    if pdf_bytes is None:
+    if skip_existing:
+        try:
+            filename = generate_filename(document_id, document_agency, document_name, document_date)
+        except ValueError as e:
+            print(f"Error saving PDF: {e}")
+            return None
+        file_path = os.path.join(output_dir, filename)
+        if os.path.exists(file_path):
+            print(f"PDF already exists, skipping download: {file_path}")
+            return file_path
+
+    try:
+        pdf_bytes = fetch_pdf_bytes(document_id)
+    except Exception as e:
+        print(f"Failed to fetch PDF for {document_id}: {e}")
         return None
 
     try:
@@ -80,6 +138,21 @@ def download_michigan_pdf(document_id, document_agency=None, document_name=None,
         print(f"Error saving PDF: {e}")
         return None
 
+@functools.lru_cache(maxsize=2048)
+def clean_string(s):
+    """Make a string filesystem-safe.
+
+    Cached because the same agency names recur across many documents.
+    """
+    if not s:
+        return ""
+    # Replace problematic characters and whitespace runs in one pass
+    s = _UNSAFE_RE.sub('_', s)
+    # Remove leading/trailing underscores
+    s = s.strip('_')
+    return s
+
+
 def generate_filename(document_id, document_agency, document_name, document_date):
     """
     Generate a filename based on the provided parameters
@@ -93,18 +166,6 @@ def generate_filename(document_id, document_agency, document_name, document_date
     Returns:
         str: Generated filename
     """
-    # Clean up strings to be filesystem-safe
-    def clean_string(s):
-        if not s:
-            return ""
-        # Remove/replace problematic characters
-        s = re.sub(r'[<>:"/\\|?*]', '_', s)
-        # Remove extra whitespace
-        s = re.sub(r'\s+', '_', s)
-        # Remove leading/trailing underscores
-        s = s.strip('_')
-        return s
-
     # Build filename components
     parts = []
 
@@ -116,7 +177,7 @@ def generate_filename(document_id, document_agency, document_name, document_date
 
     if document_date:
         # Ensure the date is in YYYY-MM-DD format
-        match = re.match(r'(\d{4})[-/](\d{2})[-/](\d{2})', str(document_date))
+        match = _DATE_RE.match(str(document_date))
         # Raise error if month > 12
         if match:
             if int(match.group(2)) > 12:
@@ -146,6 +207,8 @@ if __name__ == "__main__":
     parser.add_argument("--name", dest="document_name", help="Document name for filename", default=None)
     parser.add_argument("--output-dir", dest="output_dir", help="Directory to save the PDF", default="./")
     parser.add_argument("--date", dest="document_date", help="Document date for filename (YYYY-MM-DD)", default=None)
+    parser.add_argument("--no-skip", dest="skip_existing", action="store_false",
+                        help="Re-download even if the PDF already exists in the output directory")
 
     args = parser.parse_args()
 
@@ -154,5 +217,6 @@ if __name__ == "__main__":
         document_agency=args.document_agency,
         document_name=args.document_name,
         document_date=args.document_date,
-        output_dir=args.output_dir
+        output_dir=args.output_dir,
+        skip_existing=args.skip_existing
     )
\ No newline at end of file
@@ -267,23 +267,30 @@ def process_parquet_files(parquet_dir: str, output_csv: str) -> None:
 
     for parquet_file in sorted(parquet_files):
         try:
-            df = pd.read_parquet(parquet_file)
-            for _, row in df.iterrows():
-                if row["sha256"] in existing_sha256s:
-                    skipped += 1
-                    continue
+            # Read just the hashes first; files with nothing new never have
+            # their page text decoded
+            sha256s = pd.read_parquet(parquet_file, columns=["sha256"])["sha256"]
 
+            # Drop already-processed and repeated hashes in one vectorized
+            # pass so only new documents reach the Python loop
+            is_new = ~sha256s.isin(existing_sha256s) & ~sha256s.duplicated()
+            skipped += int((~is_new).sum())
+            if not is_new.any():
+                continue
+
+            df = pd.read_parquet(parquet_file)
+            for row in df[is_new].itertuples(index=False):
                 try:
-                    text_pages = ast.literal_eval(row['text']) if isinstance(row['text'], str) else row['text']
+                    text_pages = ast.literal_eval(row.text) if isinstance(row.text, str) else row.text
                 except (ValueError, SyntaxError):
-                    logger.error(f"Failed to parse text for document {row['sha256']}")
+                    logger.error(f"Failed to parse text for document {row.sha256}")
                     continue
 
                 parsed = parse_document(text_pages)
-                parsed['sha256'] = row['sha256']
-                parsed['date_processed'] = row['dateprocessed']
+                parsed['sha256'] = row.sha256
+                parsed['date_processed'] = row.dateprocessed
                 new_records.append(parsed)
-                existing_sha256s.add(row['sha256'])
+                existing_sha256s.add(row.sha256)
 
         except Exception as e:
             logger.error(f"Error processing {parquet_file.name}: {e}")
@@ -304,19 +311,22 @@ def process_parquet_files(parquet_dir: str, output_csv: str) -> None:
     write_header = not output_path.exists()
 
     with open(output_csv, 'a', newline='', encoding='utf-8') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        writer = csv.writer(csvfile)
         if write_header:
-            writer.writeheader()
-        for record in new_records:
-            writer.writerow({
-                'agency_id': record['agency_id'] or '',
-                'date': record['date'] or '',
-                'agency_name': record['agency_name'] or '',
-                'document_title': record['document_title'] or '',
-                'is_special_investigation': record['is_special_investigation'],
-                'sha256': record['sha256'],
-                'date_processed': record['date_processed']
-            })
+            writer.writerow(fieldnames)
+        # Plain tuples in fieldnames order, handed over in one writerows call
+        writer.writerows(
+            (
+                record['agency_id'] or '',
+                record['date'] or '',
+                record['agency_name'] or '',
+                record['document_title'] or '',
+                record['is_special_investigation'],
+                record['sha256'],
+                record['date_processed'],
+            )
+            for record in new_records
+        )
 
     logger.info(f"Appended {len(new_records)} new records to {output_csv}")
 
@@ -1,8 +1,24 @@
 """Shared utilities for the ingestion pipeline."""
 
+import threading
+import time
 from datetime import datetime
 from typing import Optional
 
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# The state API's certificate chain does not verify, so every call passes
+# verify=False; silence the resulting warning once for all API modules
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+# One requests.Session per thread so keep-alive connections (and their TLS
+# sessions) are reused across API calls without sharing a Session between
+# worker threads.
+_thread_local = threading.local()
+
 
 def parse_created_date_to_iso(created_date: str) -> Optional[str]:
     """Parse a CreatedDate string to ISO date (YYYY-MM-DD), or None on failure."""
@@ -15,3 +31,48 @@ def parse_created_date_to_iso(created_date: str) -> Optional[str]:
         except ValueError:
             continue
     return None
+
+
+def get_session() -> requests.Session:
+    """Return this thread's pooled Session for the Michigan API.
+
+    Transient failures (connection errors, 429 and 5xx responses) are retried
+    with exponential backoff, honouring any Retry-After header.
+    """
+    session = getattr(_thread_local, "session", None)
+    if session is None:
+        retry = Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=None,  # the API is called with POST; retry it too
+            respect_retry_after_header=True,
+        )
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(pool_maxsize=32, max_retries=retry))
+        _thread_local.session = session
+    return session
+
+
+class RateLimiter:
+    """Space out API calls so at most one starts every ``min_interval`` seconds.
+
+    A single limiter is shared by all worker threads, so the overall request
+    rate against the API stays the same however many workers are running.
+    """
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    def wait(self) -> None:
+        """Block until the caller may start its next API call."""
+        if self.min_interval <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
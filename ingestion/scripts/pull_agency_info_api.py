@@ -1,12 +1,26 @@
-import requests
 import json
-import urllib3
 
-def get_all_agency_info():
-    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+from pipeline_utils import get_session
+
+API_URL = "https://michildwelfarepubliclicensingsearch.michigan.gov/licagencysrch/webruntime/api/apex/execute"
+
+API_GET_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept': 'application/json, text/plain, */*',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Referer': 'https://michildwelfarepubliclicensingsearch.michigan.gov/licagencysrch/'
+}
 
-    base_url = "https://michildwelfarepubliclicensingsearch.michigan.gov/licagencysrch/webruntime/api/apex/execute"
+API_POST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept': 'application/json, text/plain, */*',
+    'Content-Type': 'application/json',
+    'X-Requested-With': 'XMLHttpRequest',
+    'Origin': 'https://michildwelfarepubliclicensingsearch.michigan.gov',
+    'Referer': 'https://michildwelfarepubliclicensingsearch.michigan.gov/licagencysrch/'
+}
 
+def get_all_agency_info():
     params = {
         "cacheable": "true",
         "classname": "@udd/01p8z0000009E4V",
@@ -19,15 +33,8 @@ def get_all_agency_info():
         "htmlEncode": "false"
     }
 
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-        'Accept': 'application/json, text/plain, */*',
-        'Accept-Language': 'en-US,en;q=0.9',
-        'Referer': 'https://michildwelfarepubliclicensingsearch.michigan.gov/licagencysrch/'
-    }
-
     try:
-        response = requests.get(base_url, params=params, headers=headers, verify=False, timeout=30)
+        response = get_session().get(API_URL, params=params, headers=API_GET_HEADERS, verify=False, timeout=30)
         response.raise_for_status()
         return response.json()
     except Exception as e:
@@ -38,10 +45,6 @@ def get_agency_document_list(record_id):
     """
     POST with JSON payload directly to the API endpoint
     """
-    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-
-    base_url = "https://michildwelfarepubliclicensingsearch.michigan.gov/licagencysrch/webruntime/api/apex/execute"
-
     # JSON payload
     payload = {
         "namespace": "",
@@ -54,20 +57,11 @@ def get_agency_document_list(record_id):
         "cacheable": False
     }
 
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-        'Accept': 'application/json, text/plain, */*',
-        'Content-Type': 'application/json',
-        'X-Requested-With': 'XMLHttpRequest',
-        'Origin': 'https://michildwelfarepubliclicensingsearch.michigan.gov',
-        'Referer': 'https://michildwelfarepubliclicensingsearch.michigan.gov/licagencysrch/'
-    }
-
     try:
-        response = requests.post(
-            base_url,
+        response = get_session().post(
+            API_URL,
             json=payload,
-            headers=headers,
+            headers=API_POST_HEADERS,
             verify=False,
             timeout=30
         )
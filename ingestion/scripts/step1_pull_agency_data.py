@@ -51,15 +51,12 @@ def run(facility_info_csv: str) -> None:
     )
     print(f"Fetched {len(agency_list)} agencies from API")
 
-    # Build DataFrame from API data
-    api_rows = []
-    for agency in agency_list:
-        if not isinstance(agency, dict):
-            continue
-        license_number = (agency.get("LicenseNumber") or "").strip()
-        if not license_number:
-            continue
-        api_rows.append({col: agency.get(col, "") for col in FACILITY_INFO_COLUMNS})
+    # Build DataFrame from API data; the constructor picks out just the
+    # facility columns, so no per-agency dict needs to be rebuilt
+    api_rows = [
+        agency for agency in agency_list
+        if isinstance(agency, dict) and (agency.get("LicenseNumber") or "").strip()
+    ]
 
     api_df = pd.DataFrame(api_rows, columns=FACILITY_INFO_COLUMNS).fillna("")
     api_license_numbers = set(api_df["LicenseNumber"].unique())
@@ -15,15 +15,19 @@ Behaviour:
   (only when *every* agency call succeeded, so partial failures don't
   incorrectly mark documents as gone).
 - Never deletes rows.
+
+Agency document lists are fetched concurrently (--workers); the database is
+only ever updated on the main thread, in agency order.
 """
 
 import argparse
 import os
-import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 
 import pandas as pd
 
+from pipeline_utils import RateLimiter
 from pull_agency_info_api import get_all_agency_info, get_agency_document_list
 
 DEFAULT_DOWNLOAD_DB_CSV = "ingestion/data/downloaded_files_database.csv"
@@ -69,11 +73,9 @@ def _build_cdid_to_body_lookup(db: pd.DataFrame) -> dict[str, str]:
     When a document has multiple rows (old unavailable + current active),
     only the active one is returned.
     """
-    lookup: dict[str, str] = {}
-    for cbid, row in db.iterrows():
-        if row["download_status"] != "unavailable" and row["ContentDocumentId"]:
-            lookup[row["ContentDocumentId"]] = cbid
-    return lookup
+    active = db[(db["download_status"] != "unavailable") & (db["ContentDocumentId"] != "")]
+    # dict(zip(...)) keeps the last row per key, matching row-order overwrites
+    return dict(zip(active["ContentDocumentId"], active.index))
 
 
 def _update_existing_row(db: pd.DataFrame, cbid: str, agency_name: str,
@@ -108,7 +110,7 @@ def _make_new_row(cdid: str, agency_name: str, agency_id: str,
     return row
 
 
-def run(download_db_csv: str, sleep_seconds: float = 0.0) -> None:
+def run(download_db_csv: str, sleep_seconds: float = 0.0, workers: int = 8) -> None:
     """Fetch document lists for all agencies and update the download database."""
     db = _load_db(download_db_csv)
 
@@ -134,64 +136,77 @@ def run(download_db_csv: str, sleep_seconds: float = 0.0) -> None:
     new_cbids_this_run: set[str] = set()  # dedup within this run
     body_id_changes = 0
 
-    n_agencies = len(agency_list)
-    agencies_processed = 0
+    agencies = []
     for agency in agency_list:
         agency_id = (agency.get("agencyId") or "").strip()
         agency_name = (agency.get("AgencyName") or "").strip()
-        if not agency_id:
-            continue
-
-        if sleep_seconds > 0:
-            time.sleep(sleep_seconds)
-
-        agencies_processed += 1
-        if agencies_processed % 10 == 0 or agencies_processed == n_agencies:
-            print(f"  Fetching document lists... {agencies_processed}/{n_agencies}")
-
-        pdf_results = get_agency_document_list(agency_id)
-        if not pdf_results:
-            failed_agency_count += 1
-            continue
-
-        records = pdf_results.get("returnValue", {}).get("contentVersionRes", [])
-        if not isinstance(records, list):
-            failed_agency_count += 1
-            continue
-
-        for record in records:
-            cdid = (record.get("ContentDocumentId") or "").strip()
-            new_cbid = (record.get("ContentBodyId") or "").strip()
-            if not cdid or not new_cbid:
+        if agency_id:
+            agencies.append((agency_id, agency_name))
+
+    # The calls are network-bound, so overlap them across a small thread
+    # pool.  map() yields results in agency order, so the updates below run
+    # exactly as they would serially.
+    limiter = RateLimiter(sleep_seconds)
+
+    def fetch(agency_id: str) -> dict | None:
+        limiter.wait()
+        return get_agency_document_list(agency_id)
+
+    n_agencies = len(agencies)
+    agencies_processed = 0
+    executor = ThreadPoolExecutor(max_workers=max(1, workers))
+    try:
+        results = executor.map(fetch, [agency_id for agency_id, _ in agencies])
+        for (agency_id, agency_name), pdf_results in zip(agencies, results):
+            agencies_processed += 1
+            if agencies_processed % 10 == 0 or agencies_processed == n_agencies:
+                print(f"  Fetching document lists... {agencies_processed}/{n_agencies}")
+
+            if not pdf_results:
+                failed_agency_count += 1
+                continue
+
+            records = pdf_results.get("returnValue", {}).get("contentVersionRes", [])
+            if not isinstance(records, list):
+                failed_agency_count += 1
                 continue
 
-            api_seen_cbids.add(new_cbid)
-
-            if new_cbid in db.index:
-                # Same ContentBodyId — just refresh metadata
-                _update_existing_row(db, new_cbid, agency_name, agency_id, record, now_utc)
-            elif cdid in cdid_to_cbid:
-                # Same ContentDocumentId but different ContentBodyId —
-                # content was replaced upstream.  Mark old row unavailable
-                # and create a fresh pending row for re-download.
-                old_cbid = cdid_to_cbid[cdid]
-                db.at[old_cbid, "download_status"] = "unavailable"
-                db.at[old_cbid, "unavailable_marked_at_utc"] = now_utc
-                del cdid_to_cbid[cdid]
-                body_id_changes += 1
-                print(
-                    f"  ContentBodyId changed for {cdid}: "
-                    f"{old_cbid} -> {new_cbid}, scheduling re-download"
-                )
-                if new_cbid not in new_cbids_this_run:
+            for record in records:
+                cdid = (record.get("ContentDocumentId") or "").strip()
+                new_cbid = (record.get("ContentBodyId") or "").strip()
+                if not cdid or not new_cbid:
+                    continue
+
+                api_seen_cbids.add(new_cbid)
+
+                if new_cbid in db.index:
+                    # Same ContentBodyId — just refresh metadata
+                    _update_existing_row(db, new_cbid, agency_name, agency_id, record, now_utc)
+                elif cdid in cdid_to_cbid:
+                    # Same ContentDocumentId but different ContentBodyId —
+                    # content was replaced upstream.  Mark old row unavailable
+                    # and create a fresh pending row for re-download.
+                    old_cbid = cdid_to_cbid[cdid]
+                    db.at[old_cbid, "download_status"] = "unavailable"
+                    db.at[old_cbid, "unavailable_marked_at_utc"] = now_utc
+                    del cdid_to_cbid[cdid]
+                    body_id_changes += 1
+                    print(
+                        f"  ContentBodyId changed for {cdid}: "
+                        f"{old_cbid} -> {new_cbid}, scheduling re-download"
+                    )
+                    if new_cbid not in new_cbids_this_run:
+                        new_rows.append(_make_new_row(cdid, agency_name, agency_id, record, now_utc))
+                        new_cbids_this_run.add(new_cbid)
+                        cdid_to_cbid[cdid] = new_cbid
+                elif new_cbid not in new_cbids_this_run:
+                    # Entirely new document
                     new_rows.append(_make_new_row(cdid, agency_name, agency_id, record, now_utc))
                     new_cbids_this_run.add(new_cbid)
                     cdid_to_cbid[cdid] = new_cbid
-            elif new_cbid not in new_cbids_this_run:
-                # Entirely new document
-                new_rows.append(_make_new_row(cdid, agency_name, agency_id, record, now_utc))
-                new_cbids_this_run.add(new_cbid)
-                cdid_to_cbid[cdid] = new_cbid
+    finally:
+        # On an error or Ctrl-C, drop agencies that have not been fetched yet
+        executor.shutdown(wait=False, cancel_futures=True)
 
     # Append new rows
     if new_rows:
@@ -242,10 +257,16 @@ def main() -> None:
         dest="sleep_seconds",
         type=float,
         default=0.5,
-        help="Seconds to sleep between agency API calls (default: 0.5)",
+        help="Minimum seconds between agency API calls, shared across all workers (default: 0.5)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="Number of agency document lists to fetch concurrently (default: 8)",
     )
     args = parser.parse_args()
-    run(args.download_db_csv, sleep_seconds=args.sleep_seconds)
+    run(args.download_db_csv, sleep_seconds=args.sleep_seconds, workers=args.workers)
 
 
 if __name__ == "__main__":
@@ -7,13 +7,19 @@ For each pending document in downloaded_files_database.csv:
 3. Extract page text via pdfplumber
 4. Append the result to a new timestamped parquet file
 
+Documents are fetched concurrently (--workers) and their text is extracted
+in a pool of worker processes (--extract-workers); results are merged into
+the database and parquet batch on the main thread.
+
 Use --save-pdfs DIR to also persist the raw PDF files to disk.
 """
 
 import argparse
+import csv
 import hashlib
+import multiprocessing
 import os
-import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -21,18 +27,159 @@ import pandas as pd
 
 from download_pdf import fetch_pdf_bytes, save_pdf
 from extract_pdf_text import extract_text_from_pdf_bytes
-from pipeline_utils import parse_created_date_to_iso
+from pipeline_utils import RateLimiter, parse_created_date_to_iso
 
 DEFAULT_DOWNLOAD_DB_CSV = "ingestion/data/downloaded_files_database.csv"
 DEFAULT_PARQUET_DIR = "ingestion/data/parquet_files"
 
 
+def _process_document(
+    row: pd.Series,
+    limiter: RateLimiter,
+    extract_pool: ProcessPoolExecutor,
+    save_pdfs_dir: str | None,
+) -> dict:
+    """Fetch, hash, and extract text for one document.  Runs in a worker thread.
+
+    Returns a dict with a ``status`` of ``ok``, ``fetch_failed``, or
+    ``extract_failed``; successful results also carry ``sha256`` and
+    ``pages_text`` and their timestamps, failures carry the ``error``.
+    """
+    content_document_id = row["ContentDocumentId"]
+    agency_name = row.get("agency_name", "")
+
+    # Fetch PDF bytes from the API, paced across all workers
+    limiter.wait()
+    try:
+        pdf_bytes = fetch_pdf_bytes(content_document_id)
+    except Exception as e:
+        return {"status": "fetch_failed", "error": e}
+
+    # SHA256 directly on the bytes — no disk needed
+    sha = hashlib.sha256(pdf_bytes).hexdigest()
+
+    # Extract text in a worker process; pdfplumber is pure Python and would
+    # otherwise serialise every fetch thread on the GIL
+    try:
+        pages_text = extract_pool.submit(extract_text_from_pdf_bytes, pdf_bytes).result()
+    except Exception as e:
+        return {"status": "extract_failed", "error": e}
+
+    # Optionally save PDF to disk
+    if save_pdfs_dir:
+        created_date_iso = parse_created_date_to_iso(row.get("CreatedDate", ""))
+        save_pdf(
+            pdf_bytes, content_document_id,
+            document_agency=agency_name or None,
+            document_name=row.get("Title", "") or None,
+            document_date=created_date_iso,
+            output_dir=save_pdfs_dir,
+        )
+
+    return {
+        "status": "ok",
+        "sha256": sha,
+        "pages_text": pages_text,
+        "dateprocessed": datetime.now().isoformat(),
+        "downloaded_at_utc": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def _save_batch(
+    db: pd.DataFrame,
+    download_db_csv: str,
+    records: list[dict],
+    parquet_dir: str,
+    skipped_duplicate: int,
+) -> None:
+    """Write the parquet batch, then the download database that points at it."""
+    # Parquet first: if this fails, the rows stay pending and are retried
+    if records:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_parquet = Path(parquet_dir) / f"{timestamp}_pdf_text.parquet"
+        pd.DataFrame(records).to_parquet(output_parquet, compression="zstd", index=False)
+        print(f"Saved {len(records)} records to {output_parquet}")
+    else:
+        print("No new records to write to parquet.")
+
+    db.to_csv(download_db_csv, index=False, lineterminator="\r\n")
+    print(f"Download database updated: {download_db_csv} ({len(records)} new, {skipped_duplicate} duplicate sha256 skipped)")
+
+
+def _report_failures(failures: list[tuple[str, str, str]], failures_csv: str | None) -> None:
+    """Summarise documents that failed this run, optionally writing them to CSV."""
+    if not failures:
+        return
+    print(f"{len(failures)} document(s) failed and remain pending")
+    if failures_csv:
+        with open(failures_csv, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["ContentDocumentId", "agency_name", "error"])
+            writer.writerows(failures)
+        print(f"Failure details written to {failures_csv}")
+
+
+def _merge_results(
+    db: pd.DataFrame,
+    pending_indices: list[int],
+    completed: dict[int, dict],
+    existing_hashes: set[str],
+) -> tuple[list[dict], int, list[tuple[str, str, str]]]:
+    """Apply finished results to the database in pending order.
+
+    Returns the parquet records, the number of duplicate sha256s skipped,
+    and the failures.  Walking ``pending_indices`` rather than completion
+    order keeps the batch's row order, and which ContentDocumentId wins a
+    repeated sha256, the same from run to run.
+    """
+    records: list[dict] = []
+    failures: list[tuple[str, str, str]] = []
+    skipped_duplicate = 0
+
+    for idx in pending_indices:
+        result = completed.get(idx)
+        if result is None:
+            continue
+        content_document_id = db.at[idx, "ContentDocumentId"]
+
+        if result["status"] != "ok":
+            failures.append((content_document_id, db.at[idx, "agency_name"], repr(result["error"])))
+            continue
+
+        sha = result["sha256"]
+
+        # Only add to parquet if this sha256 isn't already in existing files
+        if sha in existing_hashes:
+            skipped_duplicate += 1
+            print(f"  {content_document_id}: sha256 already in parquet, skipped")
+        else:
+            records.append({
+                "sha256": sha,
+                "ContentDocumentId": content_document_id,
+                "text": result["pages_text"],
+                "dateprocessed": result["dateprocessed"],
+            })
+            existing_hashes.add(sha)
+
+        # Update the database row only once its text is queued for
+        # parquet, so an interrupt never saves a "downloaded" row whose
+        # text was lost
+        db.at[idx, "sha256"] = sha
+        db.at[idx, "downloaded_at_utc"] = result["downloaded_at_utc"]
+        db.at[idx, "download_status"] = "downloaded"
+
+    return records, skipped_duplicate, failures
+
+
 def run(
     download_db_csv: str,
     parquet_dir: str,
     limit: int | None,
     sleep_seconds: float,
     save_pdfs_dir: str | None,
+    workers: int = 8,
+    failures_csv: str | None = None,
+    extract_workers: int | None = None,
 ) -> None:
     """Fetch, parse, and record unprocessed PDFs."""
     if not os.path.exists(download_db_csv):
@@ -67,77 +214,47 @@ def run(
             pass
     print(f"Loaded {len(existing_hashes)} existing hashes from parquet files")
 
-    # Collect parquet records for this batch
-    records: list[dict] = []
-    skipped_duplicate = 0
+    # Results keyed by database index; merged in database order below so
+    # the parquet batch and duplicate handling don't depend on timing
+    completed: dict[int, dict] = {}
+    n_pending = len(pending_indices)
 
-    for i, idx in enumerate(pending_indices, 1):
-        row = db.loc[idx]
-        content_document_id = row["ContentDocumentId"]
-        agency_name = row.get("agency_name", "")
-
-        # Fetch PDF bytes from the API
-        pdf_bytes = fetch_pdf_bytes(content_document_id)
-        if pdf_bytes is None:
-            print(f"  [{i}/{len(pending_indices)}] Failed to fetch {content_document_id}")
-            continue
-
-        # SHA256 directly on the bytes — no disk needed
-        sha = hashlib.sha256(pdf_bytes).hexdigest()
-
-        # Extract text in memory
-        try:
-            pages_text = extract_text_from_pdf_bytes(pdf_bytes)
-        except Exception as e:
-            print(f"  [{i}/{len(pending_indices)}] pdfplumber failed for {content_document_id}: {e}")
-            continue
-
-        # Optionally save PDF to disk
-        if save_pdfs_dir:
-            created_date_iso = parse_created_date_to_iso(row.get("CreatedDate", ""))
-            save_pdf(
-                pdf_bytes, content_document_id,
-                document_agency=agency_name or None,
-                document_name=row.get("Title", "") or None,
-                document_date=created_date_iso,
-                output_dir=save_pdfs_dir,
-            )
-
-        # Update the database row
-        now_utc = datetime.now(timezone.utc).isoformat()
-        db.at[idx, "sha256"] = sha
-        db.at[idx, "downloaded_at_utc"] = now_utc
-        db.at[idx, "download_status"] = "downloaded"
-
-        # Only add to parquet if this sha256 isn't already in existing files
-        if sha in existing_hashes:
-            skipped_duplicate += 1
-            print(f"  [{i}/{len(pending_indices)}] Processed {content_document_id} ({len(pages_text)} pages) — sha256 already in parquet, skipped")
-        else:
-            records.append({
-                "sha256": sha,
-                "ContentDocumentId": content_document_id,
-                "text": pages_text,
-                "dateprocessed": datetime.now().isoformat(),
-            })
-            existing_hashes.add(sha)
-            print(f"  [{i}/{len(pending_indices)}] Processed {content_document_id} ({len(pages_text)} pages)")
-
-        if sleep_seconds > 0 and i < len(pending_indices):
-            time.sleep(sleep_seconds)
-
-    # Save updated DB
-    db.to_csv(download_db_csv, index=False, lineterminator="\r\n")
-    print(f"Download database updated: {download_db_csv} ({len(records)} new, {skipped_duplicate} duplicate sha256 skipped)")
+    # Fetching is network-bound, so overlap requests across a small thread
+    # pool; text extraction is CPU-bound and goes to a process pool.  All
+    # DataFrame and record bookkeeping stays on the main thread.  "spawn"
+    # avoids forking while fetch threads hold locks.
+    limiter = RateLimiter(sleep_seconds)
+    extract_pool = ProcessPoolExecutor(
+        max_workers=extract_workers, mp_context=multiprocessing.get_context("spawn")
+    )
+    executor = ThreadPoolExecutor(max_workers=max(1, workers))
+    try:
+        futures = {
+            executor.submit(_process_document, db.loc[idx], limiter, extract_pool, save_pdfs_dir): idx
+            for idx in pending_indices
+        }
+        for i, future in enumerate(as_completed(futures), 1):
+            idx = futures.pop(future)
+            result = future.result()
+            completed[idx] = result
+            content_document_id = db.at[idx, "ContentDocumentId"]
 
-    # Write parquet batch
-    if records:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_parquet = Path(parquet_dir) / f"{timestamp}_pdf_text.parquet"
-        pd.DataFrame(records).to_parquet(output_parquet, compression="zstd", index=False)
-        print(f"Saved {len(records)} records to {output_parquet}")
-    else:
-        print("No new records to write to parquet.")
+            if result["status"] == "fetch_failed":
+                print(f"  [{i}/{n_pending}] Failed to fetch {content_document_id}: {result['error']}")
+            elif result["status"] == "extract_failed":
+                print(f"  [{i}/{n_pending}] pdfplumber failed for {content_document_id}: {result['error']}")
+            else:
+                print(f"  [{i}/{n_pending}] Processed {content_document_id} ({len(result['pages_text'])} pages)")
+    finally:
+        # On an error or Ctrl-C, drop queued documents and still persist
+        # everything that finished, so the next run resumes from there.
+        executor.shutdown(wait=False, cancel_futures=True)
+        extract_pool.shutdown(wait=False, cancel_futures=True)
+        records, skipped_duplicate, failures = _merge_results(
+            db, pending_indices, completed, existing_hashes
+        )
+        _save_batch(db, download_db_csv, records, parquet_dir, skipped_duplicate)
+        _report_failures(failures, failures_csv)
 
 
 def main() -> None:
@@ -165,7 +282,19 @@ def main() -> None:
         dest="sleep_seconds",
         type=float,
         default=0.0,
-        help="Seconds to sleep between API calls",
+        help="Minimum seconds between API calls, shared across all workers",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="Number of documents to fetch concurrently (default: 8)",
+    )
+    parser.add_argument(
+        "--extract-workers",
+        type=int,
+        default=None,
+        help="Number of processes for PDF text extraction (default: CPU count)",
     )
     parser.add_argument(
         "--save-pdfs",
@@ -174,6 +303,12 @@ def main() -> None:
         metavar="DIR",
         help="Also save raw PDF files to this directory",
     )
+    parser.add_argument(
+        "--failures-csv",
+        default=None,
+        metavar="PATH",
+        help="Write documents that failed to fetch or parse to this CSV",
+    )
     args = parser.parse_args()
 
     run(
@@ -182,6 +317,9 @@ def main() -> None:
         limit=args.limit,
         sleep_seconds=args.sleep_seconds,
         save_pdfs_dir=args.save_pdfs_dir,
+        workers=args.workers,
+        failures_csv=args.failures_csv,
+        extract_workers=args.extract_workers,
     )
 
 
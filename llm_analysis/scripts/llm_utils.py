@@ -5,17 +5,25 @@ import json
 import logging
 import os
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 
 import pandas as pd
+import pyarrow.parquet as pq
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
 # OpenRouter API configuration
 OPENROUTER_API_URL = 'https://openrouter.ai/api/v1/chat/completions'
 MODEL = 'deepseek/deepseek-v3.2'
 
+_JSON_DECODER = json.JSONDecoder()
+
 
 def setup_logger(name: str, log_filename: str) -> logging.Logger:
     """Set up a logger with console and file handlers.
@@ -57,41 +65,96 @@ def get_api_key() -> str:
     return api_key
 
 
-def load_document_from_parquet(sha256: str, parquet_dir: str) -> Optional[Dict]:
-    """Load a document from parquet files by SHA256 hash."""
-    parquet_path = Path(parquet_dir)
-    parquet_files = list(parquet_path.glob("*.parquet"))
+def _read_row_group_hashes(parquet_file: Path) -> List[List[str]]:
+    """Read the sha256 column of each row group in a file; [] if unreadable."""
+    try:
+        pf = pq.ParquetFile(parquet_file)
+        return [
+            pf.read_row_group(group, columns=['sha256']).column('sha256').to_pylist()
+            for group in range(pf.num_row_groups)
+        ]
+    except Exception:
+        return []
 
-    for parquet_file in parquet_files:
-        try:
-            df = pd.read_parquet(parquet_file)
-            matches = df[df['sha256'] == sha256]
 
-            if not matches.empty:
-                row = matches.iloc[0]
+def _build_parquet_index(parquet_dir: str) -> Dict[str, Tuple[Path, int, int]]:
+    """Map each sha256 to the (parquet file, row group, row) holding its text.
 
-                # Parse text
-                text_data = row['text']
-                if isinstance(text_data, str):
-                    text_stripped = text_data.strip()
-                    if text_stripped.startswith('[') and text_stripped.endswith(']'):
-                        text_pages = ast.literal_eval(text_data)
-                    else:
-                        text_pages = []
-                else:
-                    text_pages = list(text_data) if text_data is not None else []
+    Only the sha256 column is read.  When a hash appears more than once,
+    the first occurrence wins.
+    """
+    parquet_files = sorted(Path(parquet_dir).glob("*.parquet"))
 
-                full_text = '\n\n'.join(text_pages)
+    # pyarrow releases the GIL while decoding, so read the files in parallel;
+    # map() keeps file order so "first occurrence" stays deterministic
+    with ThreadPoolExecutor(max_workers=min(8, len(parquet_files) or 1)) as executor:
+        file_hashes = list(executor.map(_read_row_group_hashes, parquet_files))
 
-                return {
-                    'sha256': row['sha256'],
-                    'text_pages': text_pages,
-                    'full_text': full_text
-                }
-        except Exception:
-            continue
+    index: Dict[str, Tuple[Path, int, int]] = {}
+    for parquet_file, groups in zip(parquet_files, file_hashes):
+        for group, hashes in enumerate(groups):
+            for row_idx, sha in enumerate(hashes):
+                index.setdefault(sha, (parquet_file, group, row_idx))
+    return index
 
-    return None
+
+_parquet_indexes: Dict[str, Dict[str, Tuple[Path, int, int]]] = {}
+_parquet_index_lock = threading.Lock()
+
+
+def _get_parquet_index(parquet_dir: str) -> Dict[str, Tuple[Path, int, int]]:
+    """Return the sha256 index for a directory, building it on first use."""
+    with _parquet_index_lock:
+        if parquet_dir not in _parquet_indexes:
+            _parquet_indexes[parquet_dir] = _build_parquet_index(parquet_dir)
+        return _parquet_indexes[parquet_dir]
+
+
+def load_document_from_parquet(sha256: str, parquet_dir: str) -> Optional[Dict]:
+    """Load a document from parquet files by SHA256 hash.
+
+    The first call for a directory indexes every file by sha256, so later
+    lookups read only the row group that holds the document.
+    """
+    location = _get_parquet_index(parquet_dir).get(sha256)
+    if location is None:
+        return None
+    parquet_file, group, row_idx = location
+
+    try:
+        # Decode one row group, skipping columns we never use
+        # (ContentDocumentId, dateprocessed)
+        table = pq.ParquetFile(parquet_file).read_row_group(group, columns=['sha256', 'text'])
+        row = table.slice(row_idx, 1).to_pylist()[0]
+    except Exception:
+        return None
+
+    # Parse text; a malformed row is treated like a missing document
+    try:
+        text_data = row['text']
+        if isinstance(text_data, str):
+            text_stripped = text_data.strip()
+            if text_stripped.startswith('[') and text_stripped.endswith(']'):
+                # Double-quoted lists are valid JSON, which parses far
+                # faster; repr()-style lists need literal_eval
+                try:
+                    text_pages = json.loads(text_data)
+                except json.JSONDecodeError:
+                    text_pages = ast.literal_eval(text_data)
+            else:
+                text_pages = []
+        else:
+            text_pages = list(text_data) if text_data is not None else []
+
+        full_text = '\n\n'.join(text_pages)
+    except (ValueError, SyntaxError, TypeError):
+        return None
+
+    return {
+        'sha256': row['sha256'],
+        'text_pages': text_pages,
+        'full_text': full_text
+    }
 
 
 def parse_json_response(ai_response: str) -> Dict:
@@ -113,21 +176,15 @@ def parse_json_response(ai_response: str) -> Dict:
     except json.JSONDecodeError:
         pass
 
-    # Try to extract JSON from mixed text by matching braces
+    # Try to extract JSON from mixed text: let the C decoder parse an object
+    # starting at each '{' in turn, ignoring whatever follows it
     start_idx = ai_response.find('{')
-    if start_idx != -1:
-        brace_count = 0
-        for i in range(start_idx, len(ai_response)):
-            if ai_response[i] == '{':
-                brace_count += 1
-            elif ai_response[i] == '}':
-                brace_count -= 1
-                if brace_count == 0:
-                    json_str = ai_response[start_idx:i+1]
-                    try:
-                        return json.loads(json_str)
-                    except json.JSONDecodeError:
-                        continue
+    while start_idx != -1:
+        try:
+            parsed, _ = _JSON_DECODER.raw_decode(ai_response, start_idx)
+            return parsed
+        except json.JSONDecodeError:
+            start_idx = ai_response.find('{', start_idx + 1)
 
     raise ValueError(f"No valid JSON object found in response: {ai_response[:200]}")
 
@@ -145,9 +202,10 @@ def get_sirs_with_violations(summaries_csv: str) -> List[str]:
     if not summaries_path.exists():
         raise FileNotFoundError(f"Summaries CSV not found: {summaries_csv}")
 
-    df = pd.read_csv(summaries_csv)
+    # Only two columns are needed; skip parsing the long summary text
+    df = pd.read_csv(summaries_csv, usecols=['sha256', 'violation'])
     violations = df[df['violation'] == 'y']
-    return [str(row['sha256']) for _, row in violations.iterrows()]
+    return violations['sha256'].astype(str).tolist()
 
 
 def load_theming_instructions(theming_path: str) -> str:
@@ -182,7 +240,7 @@ def get_existing_shas(csv_path: str, logger: logging.Logger) -> Set[str]:
         return set()
 
     try:
-        df = pd.read_csv(csv_path)
+        df = pd.read_csv(csv_path, usecols=['sha256'])
         existing_shas = set(df['sha256'].unique())
         logger.info(f"Found {len(existing_shas)} existing records in {csv_path}")
         return existing_shas
@@ -191,6 +249,57 @@ def get_existing_shas(csv_path: str, logger: logging.Logger) -> Set[str]:
         return set()
 
 
+class RateLimiter:
+    """Space out API calls so at most one starts every ``min_interval`` seconds.
+
+    A single limiter is shared by all worker threads, so the overall request
+    rate stays bounded however many workers are running.
+    """
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    def wait(self) -> None:
+        """Block until the caller may start its next API call."""
+        if self.min_interval <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+
+
+_thread_local = threading.local()
+
+
+def _get_openrouter_session() -> requests.Session:
+    """Return this thread's pooled Session for OpenRouter.
+
+    Rate limiting and gateway errors (429, 502-504) are retried with
+    exponential backoff, honouring any Retry-After header.  Read timeouts are
+    not retried, since the prompt may already have been processed and billed.
+    """
+    session = getattr(_thread_local, 'session', None)
+    if session is None:
+        retry = Retry(
+            total=3,
+            read=0,
+            backoff_factor=0.5,
+            status_forcelist=[429, 502, 503, 504],
+            allowed_methods=None,  # completions are POSTs; retry them too
+            respect_retry_after_header=True,
+            raise_on_status=False,  # hand the last response back to the caller
+        )
+        session = requests.Session()
+        session.mount('https://', HTTPAdapter(max_retries=retry))
+        _thread_local.session = session
+    return session
+
+
 def query_openrouter(api_key: str, prompt: str, title: str = 'MCYJ Datapipeline') -> Dict:
     """Send a prompt to OpenRouter and return the parsed response.
 
@@ -203,7 +312,6 @@ def query_openrouter(api_key: str, prompt: str, title: str = 'MCYJ Datapipeline'
         Dict with completion_id, ai_response, input_tokens, output_tokens,
         cached_tokens, and duration_ms
     """
-    import time
     start_time = time.time()
 
     headers = {
@@ -226,7 +334,7 @@ def query_openrouter(api_key: str, prompt: str, title: str = 'MCYJ Datapipeline'
         }
     }
 
-    response = requests.post(
+    response = _get_openrouter_session().post(
         OPENROUTER_API_URL,
         headers=headers,
         json=payload,
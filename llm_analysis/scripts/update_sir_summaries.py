@@ -49,7 +49,7 @@ def get_all_sir_shas(doc_info_csv: str):
     df = pd.read_csv(doc_info_csv)
     sirs = df[df['is_special_investigation'] == True]
     logger.info(f"Found {len(sirs)} SIRs in document info CSV")
-    return [str(row['sha256']) for _, row in sirs.iterrows()]
+    return sirs['sha256'].astype(str).tolist()
 
 
 def parse_sir_response(ai_response: str):
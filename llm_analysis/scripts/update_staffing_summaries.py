@@ -5,18 +5,19 @@ Update staffing_summaries.csv with AI-generated staffing problem classifications
 This script:
 1. Reads sir_summaries.csv to identify SIRs where violations were substantiated
 2. Compares against existing rows in llm_analysis/staffing_summaries.csv
-3. Queries up to N missing SIRs using OpenRouter API
-4. Appends new results to llm_analysis/staffing_summaries.csv
+3. Queries up to N missing SIRs using OpenRouter API, several at a time (--workers)
+4. Appends each new result to llm_analysis/staffing_summaries.csv as it arrives
 """
 
 import argparse
 import csv
 import json
 import sys
-import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 from llm_utils import (
+    RateLimiter,
     get_api_key,
     get_existing_shas,
     get_sirs_with_violations,
@@ -30,9 +31,25 @@ from llm_utils import (
 logger = setup_logger(__name__, 'update_staffing_summaries.log')
 
 
-def build_prompt(theming_instructions: str, document_text: str) -> str:
-    """Build the prompt by replacing the placeholder in the theming instructions."""
-    return theming_instructions.replace('[[ report here ]]', document_text)
+REPORT_PLACEHOLDER = '[[ report here ]]'
+
+
+def split_theming_template(theming_instructions: str) -> tuple[str, str]:
+    """Split the theming instructions around the report placeholder.
+
+    Raises:
+        ValueError: If the placeholder is missing
+    """
+    prefix, placeholder, suffix = theming_instructions.partition(REPORT_PLACEHOLDER)
+    if not placeholder:
+        raise ValueError(f"Theming instructions do not contain the {REPORT_PLACEHOLDER} placeholder")
+    return prefix, suffix
+
+
+def build_prompt(template: tuple[str, str], document_text: str) -> str:
+    """Build the prompt by placing the document between the template's halves."""
+    prefix, suffix = template
+    return f"{prefix}{document_text}{suffix}"
 
 
 def parse_staffing_response(ai_response: str):
@@ -69,6 +86,64 @@ def parse_staffing_response(ai_response: str):
     }
 
 
+def process_sir(
+    sha: str,
+    template: tuple[str, str],
+    parquet_dir: Path,
+    api_key: str,
+    limiter: RateLimiter,
+):
+    """Load, query, and parse one SIR.  Runs in a worker thread.
+
+    Returns:
+        Result row for staffing_summaries.csv, or None if the SIR failed
+    """
+    logger.info(f"Loading document from parquet: {sha}")
+    doc = load_document_from_parquet(sha, str(parquet_dir))
+
+    if not doc:
+        logger.error(f"Could not find document in parquet files: {sha}")
+        return None
+
+    logger.info(f"Document {sha}: {len(doc['text_pages'])} pages, {len(doc['full_text'])} characters")
+
+    # Build prompt using the theming template
+    prompt = build_prompt(template, doc['full_text'])
+
+    logger.info(f"Querying OpenRouter API for {sha}...")
+    try:
+        limiter.wait()
+        result = query_openrouter(api_key, prompt, 'MCYJ Datapipeline Staffing Summaries')
+
+        logger.info(f"Response received for {sha}:")
+        logger.info(f"  Input tokens: {result['input_tokens']}")
+        logger.info(f"  Output tokens: {result['output_tokens']}")
+        logger.info(f"  Cached tokens: {result['cached_tokens']}")
+        logger.info(f"  Duration: {result['duration_ms']/1000:.2f}s")
+
+        fields = parse_staffing_response(result['ai_response'])
+
+        logger.info(f"  Staffing problem: {fields['staffing_problem']}")
+        logger.info(f"  Confidence: {fields['confidence']}")
+        logger.info(f"  Primary reason: {fields['primary_reason']}")
+        logger.info(f"  Explanation preview: {fields['evidence_explanation'][:150]}...")
+
+    except Exception as e:
+        logger.error(f"Error processing query for {sha}: {e}")
+        return None
+
+    return {
+        'sha256': sha,
+        'staffing_problem': fields['staffing_problem'],
+        'confidence': fields['confidence'],
+        'primary_reason': fields['primary_reason'],
+        'evidence_staffing_cited': fields['evidence_staffing_cited'],
+        'evidence_keywords_found': json.dumps(fields['evidence_keywords_found']),
+        'evidence_quotes': json.dumps(fields['evidence_quotes']),
+        'evidence_explanation': fields['evidence_explanation'],
+    }
+
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(
@@ -101,6 +176,18 @@ def main():
         default=100,
         help='Maximum number of new SIRs to query (default: 100)'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=4,
+        help='Number of SIRs to query concurrently (default: 4)'
+    )
+    parser.add_argument(
+        '--sleep',
+        type=float,
+        default=2.0,
+        help='Minimum seconds between OpenRouter calls, shared across all workers (default: 2.0)'
+    )
 
     args = parser.parse_args()
 
@@ -124,7 +211,8 @@ def main():
     try:
         theming_instructions = load_theming_instructions(str(theming_path))
         logger.info(f"Loaded {len(theming_instructions)} characters of theming instructions")
-    except FileNotFoundError as e:
+        template = split_theming_template(theming_instructions)
+    except (FileNotFoundError, ValueError) as e:
         logger.error(str(e))
         sys.exit(1)
 
@@ -157,81 +245,50 @@ def main():
     shas_to_query = sorted(list(missing_shas))[:args.max_count]
     logger.info(f"Will query {len(shas_to_query)} SIRs")
 
-    results = []
-
-    for idx, sha in enumerate(shas_to_query, 1):
-        logger.info(f"\n{'='*80}")
-        logger.info(f"Processing SIR {idx}/{len(shas_to_query)}: {sha}")
-
-        logger.info("Loading document from parquet...")
-        doc = load_document_from_parquet(sha, str(parquet_dir))
-
-        if not doc:
-            logger.error(f"Could not find document in parquet files: {sha}")
-            continue
+    fieldnames = ['sha256', 'staffing_problem', 'confidence', 'primary_reason',
+                  'evidence_staffing_cited', 'evidence_keywords_found',
+                  'evidence_quotes', 'evidence_explanation']
 
-        logger.info(f"Document: {len(doc['text_pages'])} pages, {len(doc['full_text'])} characters")
+    # Append each result as soon as it arrives, so an interrupted run keeps
+    # every classification already paid for; the next run skips those shas
+    write_header = not output_path.exists() or output_path.stat().st_size == 0
+    results = []
 
-        # Build prompt using the theming template
-        prompt = build_prompt(theming_instructions, doc['full_text'])
+    with open(output_path, 'a', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
 
-        logger.info("Querying OpenRouter API...")
+        # Each query spends seconds waiting on the API, so keep a few in flight
+        # Pace call starts across all workers, as the sibling scripts do serially
+        limiter = RateLimiter(args.sleep)
+        executor = ThreadPoolExecutor(max_workers=max(1, args.workers))
         try:
-            result = query_openrouter(api_key, prompt, 'MCYJ Datapipeline Staffing Summaries')
-
-            logger.info(f"Response received:")
-            logger.info(f"  Input tokens: {result['input_tokens']}")
-            logger.info(f"  Output tokens: {result['output_tokens']}")
-            logger.info(f"  Cached tokens: {result['cached_tokens']}")
-            logger.info(f"  Duration: {result['duration_ms']/1000:.2f}s")
-
-            fields = parse_staffing_response(result['ai_response'])
-
-            logger.info(f"  Staffing problem: {fields['staffing_problem']}")
-            logger.info(f"  Confidence: {fields['confidence']}")
-            logger.info(f"  Primary reason: {fields['primary_reason']}")
-            logger.info(f"  Explanation preview: {fields['evidence_explanation'][:150]}...")
-
-            results.append({
-                'sha256': sha,
-                'staffing_problem': fields['staffing_problem'],
-                'confidence': fields['confidence'],
-                'primary_reason': fields['primary_reason'],
-                'evidence_staffing_cited': fields['evidence_staffing_cited'],
-                'evidence_keywords_found': json.dumps(fields['evidence_keywords_found']),
-                'evidence_quotes': json.dumps(fields['evidence_quotes']),
-                'evidence_explanation': fields['evidence_explanation'],
-            })
-
-            if idx < len(shas_to_query):
-                logger.info("Waiting 2 seconds before next query...")
-                time.sleep(2)
-
-        except Exception as e:
-            logger.error(f"Error processing query: {e}")
-            continue
+            futures = [
+                executor.submit(process_sir, sha, template, parquet_dir, api_key, limiter)
+                for sha in shas_to_query
+            ]
+            for idx, future in enumerate(as_completed(futures), 1):
+                row = future.result()
+                logger.info(f"Finished {idx}/{len(shas_to_query)} SIRs")
+                if not row:
+                    continue
+
+                if write_header:
+                    writer.writeheader()
+                    write_header = False
+                writer.writerow(row)
+                f.flush()
+                results.append(row)
+        finally:
+            # On an error or Ctrl-C, drop queued SIRs rather than paying for
+            # queries whose results would never be written
+            executor.shutdown(wait=False, cancel_futures=True)
 
     if not results:
         logger.warning("No results to save")
         sys.exit(0)
 
-    # Append results to CSV
     logger.info(f"\n{'='*80}")
-    logger.info(f"Appending {len(results)} results to {output_path}")
-
-    file_exists = output_path.exists()
-
-    fieldnames = ['sha256', 'staffing_problem', 'confidence', 'primary_reason',
-                  'evidence_staffing_cited', 'evidence_keywords_found',
-                  'evidence_quotes', 'evidence_explanation']
-
-    with open(output_path, 'a', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-
-        if not file_exists:
-            writer.writeheader()
-
-        writer.writerows(results)
+    logger.info(f"Appended {len(results)} results to {output_path}")
 
     logger.info("Done!")
 